@@ -12,12 +12,14 @@ program
     .version('1.0.0')
     .argument('<spec>', 'OpenAPI spec file (JSON or YAML)')
     .argument('[output]', 'Output directory', 'generated-playground')
-    .option('--force', 'Overwrite existing directory', false)
+    .option('--force', 'Regenerate even when nothing has changed', false)
+    .option('--full-swap', 'Replace the output directory wholesale instead of updating changed files (restarts a running Next.js dev server)', false)
     .option('--api-key <key>', 'API key for automatic authentication')
     .option('--workspace-image <url>', 'Workspace image URL or file path')
     .option('--theme <theme>', 'Default theme: light, dark, or coffee', 'light')
     .option('--popular-endpoints <endpoints>', 'Comma-separated list of endpoint keys to display on landing page')
     .option('--no-interactive', 'Skip interactive prompts')
+    .option('--verbose', 'Log every generation step and generated file', false)
     .action(async (spec: string, output: string, options: any) => {
         try {
             // Validate and parse configuration
@@ -25,17 +27,22 @@ program
                 specPath: spec,
                 outputDir: output,
                 force: options.force || false,
+                fullSwap: options.fullSwap || false,
                 apiKey: options.apiKey,
                 workspaceImage: options.workspaceImage,
                 theme: options.theme || 'light',
                 interactive: options.interactive !== false,
+                verbose: options.verbose || false,
                 popularEndpoints: options.popularEndpoints ? options.popularEndpoints.split(',').map((s: string) => s.trim()) : undefined,
             });
 
             // Generate playground
             const result = await generatePlayground(config);
 
-            if (result.success) {
+            if (result.success && result.skipped) {
+                console.log(`\n✅ Playground in ${result.outputDir} is already up to date`);
+                console.log('  Use --force to regenerate anyway');
+            } else if (result.success) {
                 console.log(`\n✅ Playground generated successfully in ${result.outputDir}`);
                 console.log(`⏱  Generation completed in ${result.duration.toFixed(2)}s`);
                 console.log('\nNext steps:');
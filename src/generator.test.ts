@@ -0,0 +1,65 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import { mkdtemp, readFile, rm, writeFile } from 'fs/promises';
+import { existsSync } from 'fs';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { generatePlayground } from './generator.js';
+import type { GeneratorConfig } from './types/index.js';
+
+const spec = {
+    openapi: '3.0.0',
+    info: { title: 'Petstore', version: '1.0.0' },
+    paths: { '/pets': { get: { operationId: 'listPets', responses: { '200': { description: 'OK' } } } } },
+};
+
+describe('generatePlayground regeneration skip', () => {
+    let dir: string;
+    let config: GeneratorConfig;
+
+    beforeEach(async () => {
+        dir = await mkdtemp(join(tmpdir(), 'madrasly-test-'));
+        process.env.XDG_CACHE_HOME = join(dir, 'cache');
+        await writeFile(join(dir, 'openapi.json'), JSON.stringify(spec));
+        config = {
+            specPath: join(dir, 'openapi.json'),
+            outputDir: join(dir, 'playground'),
+            force: false,
+            fullSwap: false,
+            theme: 'light',
+            interactive: false,
+            verbose: false,
+        };
+    });
+
+    afterEach(async () => {
+        delete process.env.XDG_CACHE_HOME;
+        await rm(dir, { recursive: true, force: true });
+    });
+
+    it('skips a second run with unchanged inputs', async () => {
+        const first = await generatePlayground(config);
+        expect(first.success).toBe(true);
+        expect(first.skipped).toBeUndefined();
+        expect(existsSync(join(config.outputDir, '.gen-hash'))).toBe(true);
+        expect(existsSync(`${config.outputDir}.tmp`)).toBe(false);
+
+        const second = await generatePlayground(config);
+        expect(second.success).toBe(true);
+        expect(second.skipped).toBe(true);
+    });
+
+    it('regenerates when the spec, options or hash change', async () => {
+        await generatePlayground(config);
+
+        expect((await generatePlayground({ ...config, theme: 'dark' })).skipped).toBeUndefined();
+        expect((await generatePlayground({ ...config, force: true })).skipped).toBeUndefined();
+
+        await writeFile(config.specPath, JSON.stringify({ ...spec, info: { ...spec.info, title: 'Renamed' } }));
+        expect((await generatePlayground(config)).skipped).toBeUndefined();
+        expect(await readFile(join(config.outputDir, 'openapi.json'), 'utf-8')).toContain('Renamed');
+
+        await rm(join(config.outputDir, '.gen-hash'));
+        expect((await generatePlayground(config)).skipped).toBeUndefined();
+        expect((await generatePlayground(config)).skipped).toBe(true);
+    });
+});
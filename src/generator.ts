@@ -1,6 +1,7 @@
-import { join, dirname } from 'path';
+import { dirname, join } from 'path';
 import { existsSync } from 'fs';
-import { writeFile, mkdir } from 'fs/promises';
+import { readFile, writeFile } from 'fs/promises';
+import { createHash } from 'crypto';
 import { fileURLToPath } from 'url';
 import type { GeneratorConfig, GenerationResult } from './types/index.js';
 import { loadOpenAPISpec } from './modules/spec-loader.js';
@@ -9,14 +10,16 @@ import {
     createDirectoryStructure,
     copyTemplateFiles,
     atomicWrite,
+    getTemplateDir,
+    listFiles,
 } from './modules/file-system.js';
 import {
     renderLayout,
     renderPage,
     renderOpenAPISpecRoute,
     renderUseOpenAPISpecHook,
-    renderPackageJson,
-    renderTsConfig,
+    renderPackageJsonContent,
+    renderTsConfigContent,
     renderNextConfig,
     renderPostcssConfig,
     renderTailwindConfig,
@@ -27,6 +30,9 @@ import {
 import { handleWorkspaceImage } from './modules/asset-handler.js';
 import { runInteractiveSetup, loadExistingConfig } from './modules/interactive-prompts.js';
 
+// Hash of everything that feeds the generated output, stored alongside it
+const GENERATION_HASH_FILE = '.gen-hash';
+
 /**
  * Main generator function - orchestrates all modules
  */
@@ -36,8 +42,15 @@ export async function generatePlayground(
     const startTime = Date.now();
     const errors: Error[] = [];
 
+    // Step progress and per-file lines are only printed with --verbose;
+    // warnings and the final summary are always shown
+    const log: (message: string) => void = config.verbose ? console.log : () => {};
+
+    // Everything is generated here first, then swapped into outputDir
+    const tempOutputDir = `${config.outputDir}.tmp`;
+
     try {
-        console.log(`Loading OpenAPI spec from ${config.specPath}...`);
+        log(`Loading OpenAPI spec from ${config.specPath}...`);
 
         // 1. Load and dereference OpenAPI spec
         let spec = await loadOpenAPISpec(config.specPath);
@@ -51,39 +64,42 @@ export async function generatePlayground(
         if (isFirstRun) {
             // First run: interactive setup or use flag
             if (config.workspaceImage) {
-                workspaceImageUrl = await handleWorkspaceImage(config.workspaceImage, `${config.outputDir}.tmp`);
+                workspaceImageUrl = await handleWorkspaceImage(config.workspaceImage, tempOutputDir, log);
             } else {
                 const setupResult = await runInteractiveSetup(spec, config);
                 if (setupResult.workspaceImage) {
-                    workspaceImageUrl = await handleWorkspaceImage(setupResult.workspaceImage, `${config.outputDir}.tmp`);
+                    workspaceImageUrl = await handleWorkspaceImage(setupResult.workspaceImage, tempOutputDir, log);
                 }
             }
         } else {
             // Regeneration: use flag or load existing
             if (config.workspaceImage) {
-                workspaceImageUrl = await handleWorkspaceImage(config.workspaceImage, `${config.outputDir}.tmp`);
+                workspaceImageUrl = await handleWorkspaceImage(config.workspaceImage, tempOutputDir, log);
             } else {
                 const existingConfig = await loadExistingConfig(config.outputDir);
                 if (existingConfig?.image) {
                     workspaceImageUrl = existingConfig.image;
-                    console.log(`  ✓ Using existing workspace image: ${workspaceImageUrl}`);
+                    log(`  ✓ Using existing workspace image: ${workspaceImageUrl}`);
                 }
             }
         }
 
         // 4. Ensure UI config with defaults
-        console.log('Ensuring x-ui-config exists...');
+        log('Ensuring x-ui-config exists...');
         spec = ensureUIConfig(spec, {
             workspaceName: undefined, // Will use API title from spec
             workspaceImage: workspaceImageUrl,
         });
 
+        // ensureUIConfig always fills x-ui-config in; look it up once for the steps below
+        const uiConfig = spec['x-ui-config']!;
+
         // 5. Handle auth configuration
-        const authConfig = spec['x-ui-config']?.auth;
+        const authConfig = uiConfig.auth;
         if (authConfig) {
             if (config.apiKey) {
                 authConfig.mode = 'automatic';
-                console.log('  Auth mode set to: automatic');
+                log('  Auth mode set to: automatic');
             } else if (authConfig.mode === 'automatic' && !config.apiKey) {
                 console.log('⚠ Warning: Auth mode is set to "automatic" but no API key provided.');
                 console.log('  Continuing with manual mode...');
@@ -93,104 +109,91 @@ export async function generatePlayground(
 
         // 5.5. Inject popularEndpoints from CLI if provided
         if (config.popularEndpoints && config.popularEndpoints.length > 0) {
-            if (!spec['x-ui-config']) {
-                spec['x-ui-config'] = { sidebar: { workspace: { name: '', icon: '' } }, endpoints: {}, auth: { mode: 'manual' } };
+            uiConfig.popularEndpoints = config.popularEndpoints;
+            log(`  ✓ Popular endpoints set: ${config.popularEndpoints.join(', ')}`);
+        }
+
+        // 5.6. Skip generation when nothing has changed since the last run
+        const specContent = JSON.stringify(spec, null, 2);
+        const generationHash = await computeGenerationHash(specContent, config);
+
+        // A workspace image flag may point at a file whose contents changed, so always regenerate then
+        if (!config.force && !isFirstRun && !config.workspaceImage) {
+            const previousHash = await readFile(join(config.outputDir, GENERATION_HASH_FILE), 'utf-8').catch(() => undefined);
+            if (previousHash === generationHash) {
+                log('✓ Spec and options unchanged, skipping generation');
+                return {
+                    success: true,
+                    outputDir: config.outputDir,
+                    duration: (Date.now() - startTime) / 1000,
+                    skipped: true,
+                };
             }
-            spec['x-ui-config'].popularEndpoints = config.popularEndpoints;
-            console.log(`  ✓ Popular endpoints set: ${config.popularEndpoints.join(', ')}`);
         }
 
         // 6. Create temp directory structure
-        const tempOutputDir = `${config.outputDir}.tmp`;
-        console.log(`Creating project structure in ${tempOutputDir}...`);
+        log(`Creating project structure in ${tempOutputDir}...`);
         await createDirectoryStructure(tempOutputDir);
-        console.log('✓ Directory structure created');
+        log('✓ Directory structure created');
 
 
         // 7. Copy template files from bundled templates directory
-        console.log('Copying template files...');
-
-        const __filename = fileURLToPath(import.meta.url);
-        const distDir = dirname(__filename); // dist/
-        const rootDir = dirname(distDir); // root directory
-        const templateDir = join(rootDir, 'templates');
-
-        await copyTemplateFiles(templateDir, tempOutputDir, { skipLayout: true });
-        console.log('✓ Template files copied');
-
-
-
-        // 8. Generate layout.tsx
-        console.log('Generating layout.tsx with theme support...');
-        const layoutContent = renderLayout(config.theme, spec);
-        await writeFile(join(tempOutputDir, 'app', 'layout.tsx'), layoutContent);
-        console.log(`✓ layout.tsx generated with default theme: ${config.theme}`);
-
-        // 9. Generate configuration files
-        console.log('Generating configuration files...');
-
-        const packageJson = renderPackageJson();
-        await writeFile(join(tempOutputDir, 'package.json'), JSON.stringify(packageJson, null, 2));
-        console.log('  ✓ package.json');
-
-        const tsConfig = renderTsConfig();
-        await writeFile(join(tempOutputDir, 'tsconfig.json'), JSON.stringify(tsConfig, null, 2));
-        console.log('  ✓ tsconfig.json');
-
-        await writeFile(join(tempOutputDir, 'next.config.mjs'), renderNextConfig());
-        console.log('  ✓ next.config.mjs');
+        log('Copying template files...');
 
-        await writeFile(join(tempOutputDir, 'postcss.config.mjs'), renderPostcssConfig());
-        console.log('  ✓ postcss.config.mjs');
+        await copyTemplateFiles(getTemplateDir(), tempOutputDir, { skipLayout: true });
+        log('✓ Template files copied');
 
-        await writeFile(join(tempOutputDir, 'tailwind.config.ts'), renderTailwindConfig());
-        console.log('  ✓ tailwind.config.ts');
 
-        await writeFile(join(tempOutputDir, '.gitignore'), renderGitignore());
-        console.log('  ✓ .gitignore');
 
-        await writeFile(join(tempOutputDir, '.env'), renderEnvFile(config.apiKey));
-        console.log('  ✓ .env');
-
-        await writeFile(join(tempOutputDir, '.nvmrc'), '20\n');
-        console.log('  ✓ .nvmrc');
-
-        // 9.5. Generate API route and hook for runtime spec loading
-        console.log('Generating runtime spec loading files...');
-        await mkdir(join(tempOutputDir, 'app', 'api', 'openapi-spec'), { recursive: true });
-        await writeFile(join(tempOutputDir, 'app', 'api', 'openapi-spec', 'route.ts'), renderOpenAPISpecRoute());
-        console.log('  ✓ app/api/openapi-spec/route.ts');
-
-        await writeFile(join(tempOutputDir, 'lib', 'use-openapi-spec.ts'), renderUseOpenAPISpecHook());
-        console.log('  ✓ lib/use-openapi-spec.ts');
-
-        // 10. Generate page components
-        console.log('Generating page components...');
-        const endpoints = Object.keys(spec['x-ui-config']?.endpoints || {});
+        // 8-12. Render the generated files; the writes are independent, so they run concurrently
+        const endpoints = Object.keys(uiConfig.endpoints || {});
         const firstEndpoint = endpoints[0] || 'default';
-        console.log(`  Found ${endpoints.length} endpoints, using '${firstEndpoint}' as default`);
-
-        const pageContent = renderPage(endpoints, firstEndpoint);
-        await writeFile(join(tempOutputDir, 'app', 'page.tsx'), pageContent);
-        console.log('  ✓ page.tsx');
-
-        // 11. Copy OpenAPI spec (already dereferenced)
-        console.log('Copying OpenAPI spec...');
-        await writeFile(
-            join(tempOutputDir, 'openapi.json'),
-            JSON.stringify(spec, null, 2)
+        log(`  Found ${endpoints.length} endpoints, using '${firstEndpoint}' as default`);
+
+        const generatedFiles: [string, string][] = [
+            // Layout with theme support
+            ['app/layout.tsx', renderLayout(config.theme, spec)],
+            // Configuration files
+            ['package.json', renderPackageJsonContent()],
+            ['tsconfig.json', renderTsConfigContent()],
+            ['next.config.mjs', renderNextConfig()],
+            ['postcss.config.mjs', renderPostcssConfig()],
+            ['tailwind.config.ts', renderTailwindConfig()],
+            ['.gitignore', renderGitignore()],
+            ['.env', renderEnvFile(config.apiKey)],
+            ['.nvmrc', '20\n'],
+            // API route and hook for runtime spec loading
+            ['app/api/openapi-spec/route.ts', renderOpenAPISpecRoute()],
+            ['lib/use-openapi-spec.ts', renderUseOpenAPISpecHook()],
+            // Page components
+            ['app/page.tsx', renderPage(endpoints, firstEndpoint)],
+            // OpenAPI spec (already dereferenced)
+            ['openapi.json', specContent],
+            ['README.md', renderReadme()],
+        ];
+
+        log('Generating layout, configuration, page and spec files...');
+        await Promise.all(
+            generatedFiles.map(([relPath, content]) => writeFile(join(tempOutputDir, relPath), content))
         );
-        console.log('  ✓ openapi.json');
-
-        // 12. Generate README
-        console.log('Generating README...');
-        await writeFile(join(tempOutputDir, 'README.md'), renderReadme());
-        console.log('  ✓ README.md');
+        for (const [relPath] of generatedFiles) {
+            log(`  ✓ ${relPath}`);
+        }
+        log(`✓ ${generatedFiles.length} files generated with default theme: ${config.theme}`);
 
         // 13. Atomic swap
-        console.log('\n🔄 Performing atomic swap...');
-        await atomicWrite(config.outputDir, tempOutputDir, !isFirstRun);
-        console.log('  ✓ Atomic swap completed');
+        // Regenerations update changed files in place to keep dev-server watchers
+        // alive unless --full-swap asks for a plain directory rename
+        log('\n🔄 Performing atomic swap...');
+        const swapComplete = await atomicWrite(config.outputDir, tempOutputDir, !isFirstRun && !config.fullSwap);
+        log('  ✓ Atomic swap completed');
+
+        // Record the hash only once the output fully matches it. The temp tree
+        // never holds it, so an interrupted or partial swap leaves no hash and
+        // the next run regenerates.
+        if (swapComplete) {
+            await writeFile(join(config.outputDir, GENERATION_HASH_FILE), generationHash);
+        }
 
         const duration = (Date.now() - startTime) / 1000;
 
@@ -215,3 +218,23 @@ export async function generatePlayground(
         };
     }
 }
+
+/**
+ * Hash the serialized spec together with the options, templates and compiled
+ * generator modules that shape the output
+ */
+async function computeGenerationHash(specContent: string, config: GeneratorConfig): Promise<string> {
+    const hash = createHash('sha256')
+        .update(JSON.stringify([config.theme, config.apiKey ?? '']))
+        .update(specContent);
+
+    // Hash file contents rather than the package version so edited templates
+    // or rebuilt render code in a checkout also invalidate the hash
+    for (const dirPath of [getTemplateDir(), dirname(fileURLToPath(import.meta.url))]) {
+        const files = await listFiles(dirPath, '', (_rel, entry) => entry.name !== 'node_modules' && entry.name !== '.next');
+        const contents = await Promise.all(files.map(rel => readFile(join(dirPath, rel))));
+        files.forEach((rel, i) => hash.update(`${rel}\0`).update(contents[i]));
+    }
+
+    return hash.digest('hex');
+}
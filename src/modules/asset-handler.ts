@@ -1,13 +1,15 @@
-import { copyFile, mkdir } from 'fs/promises';
-import { existsSync } from 'fs';
+import { copyFile, mkdir, stat, utimes } from 'fs/promises';
+import { constants } from 'fs';
 import { join, extname } from 'path';
 
 /**
- * Handle workspace image - copy file to public directory or return URL
+ * Handle workspace image - copy file to public directory or return URL.
+ * Progress lines go through `log`; warnings are always printed.
  */
 export async function handleWorkspaceImage(
     input: string | undefined,
-    outputDir: string
+    outputDir: string,
+    log: (message: string) => void = console.log
 ): Promise<string | undefined> {
     if (!input) {
         return undefined;
@@ -15,12 +17,12 @@ export async function handleWorkspaceImage(
 
     // Check if it's a URL
     if (isUrl(input)) {
-        console.log(`  ✓ Using workspace image URL: ${input}`);
+        log(`  ✓ Using workspace image URL: ${input}`);
         return input;
     }
 
     // It's a file path - copy to public directory
-    return await copyImageToPublic(input, outputDir);
+    return await copyImageToPublic(input, outputDir, log);
 }
 
 /**
@@ -35,9 +37,11 @@ export function isUrl(input: string): boolean {
  */
 export async function copyImageToPublic(
     imagePath: string,
-    outputDir: string
+    outputDir: string,
+    log: (message: string) => void = console.log
 ): Promise<string | undefined> {
-    if (!existsSync(imagePath)) {
+    const imageStats = await stat(imagePath).catch(() => undefined);
+    if (!imageStats) {
         console.warn(`  ⚠ Warning: Workspace image file not found: ${imagePath}`);
         return undefined;
     }
@@ -50,9 +54,10 @@ export async function copyImageToPublic(
     const destFilename = `workspace-logo${ext}`;
     const destPath = join(publicDir, destFilename);
 
-    // Copy the file
-    await copyFile(imagePath, destPath);
-    console.log(`  ✓ Copied workspace image to ${destFilename}`);
+    // Copy the file in-kernel (reflink where supported) and keep its mtime
+    await copyFile(imagePath, destPath, constants.COPYFILE_FICLONE);
+    await utimes(destPath, imageStats.atimeMs / 1000, imageStats.mtimeMs / 1000);
+    log(`  ✓ Copied workspace image to ${destFilename}`);
 
     // Return the public URL path
     return `/${destFilename}`;
@@ -16,67 +16,52 @@ export function ensureUIConfig(
     spec: ExtendedOpenAPISpec,
     options: EnsureUIConfigOptions = {}
 ): ExtendedOpenAPISpec {
-    // Initialize x-ui-config if missing
-    if (!spec['x-ui-config']) {
-        spec['x-ui-config'] = {
-            sidebar: {
-                workspace: {
-                    name: spec.info?.title || 'API Playground',
-                    icon: 'API',
-                },
-                user: {
-                    name: 'User',
-                    initials: 'U',
-                },
-            },
-            endpoints: {},
-            auth: {
-                mode: 'manual',
-            },
-        };
-    }
+    const apiTitle = spec.info?.title || 'API Playground';
 
-    const uiConfig = spec['x-ui-config'];
-
-    // Ensure sidebar exists
-    if (!uiConfig.sidebar) {
-        uiConfig.sidebar = {
+    // Initialize x-ui-config if missing
+    const uiConfig = (spec['x-ui-config'] ??= {
+        sidebar: {
             workspace: {
-                name: spec.info?.title || 'API Playground',
+                name: apiTitle,
                 icon: 'API',
             },
-        };
-    }
+            user: {
+                name: 'User',
+                initials: 'U',
+            },
+        },
+        endpoints: {},
+        auth: {
+            mode: 'manual',
+        },
+    });
+
+    // Ensure sidebar and workspace exist
+    const sidebar = (uiConfig.sidebar ??= {
+        workspace: {
+            name: apiTitle,
+            icon: 'API',
+        },
+    });
+    const workspace = (sidebar.workspace ??= { name: apiTitle, icon: 'API' });
 
     // Set workspace name (use provided name or API title)
-    const workspaceName = options.workspaceName || spec.info?.title || 'API Playground';
-    if (!uiConfig.sidebar.workspace) {
-        uiConfig.sidebar.workspace = {
-            name: workspaceName,
-            icon: 'API',
-        };
-    } else {
-        uiConfig.sidebar.workspace.name = workspaceName;
-        if (!uiConfig.sidebar.workspace.icon) {
-            uiConfig.sidebar.workspace.icon = 'API';
-        }
-    }
+    workspace.name = options.workspaceName || apiTitle;
+    workspace.icon ||= 'API';
 
     // Set workspace image if provided
     if (options.workspaceImage) {
-        uiConfig.sidebar.workspace.image = options.workspaceImage;
+        workspace.image = options.workspaceImage;
     }
 
     // Ensure auth config exists
-    if (!uiConfig.auth) {
-        uiConfig.auth = { mode: 'manual' };
-    }
+    const auth = (uiConfig.auth ??= { mode: 'manual' });
 
     // Auto-detect security scheme if not specified
-    if (!uiConfig.auth.schemeName) {
+    if (!auth.schemeName) {
         const detectedScheme = detectSecurityScheme(spec);
         if (detectedScheme) {
-            uiConfig.auth.schemeName = detectedScheme;
+            auth.schemeName = detectedScheme;
         }
     }
 
@@ -92,6 +77,57 @@ export function ensureUIConfig(
     return spec;
 }
 
+/**
+ * HTTP methods that get an endpoint config
+ */
+const HTTP_METHODS = ['get', 'post', 'put', 'patch', 'delete'] as const;
+
+/**
+ * Format a path into a readable title
+ */
+function formatPathToTitle(path: string): string {
+    return path
+        .replace(/^\//, '') // Remove leading slash
+        .replace(/[-_]/g, ' ') // Replace dashes and underscores with spaces
+        .replace(/\//g, ' ') // Replace remaining slashes with spaces
+        .split(' ')
+        .map(word => word.charAt(0).toUpperCase() + word.slice(1)) // Capitalize words
+        .join(' ');
+}
+
+/**
+ * Build the endpoint config for one operation. Each object comes from a
+ * single literal, so every config (and urlField) has the same shape and
+ * V8 keeps property access on them monomorphic across large specs.
+ */
+function buildEndpointConfig(
+    path: string,
+    method: string,
+    operation: OpenAPIV3.OperationObject
+): EndpointConfig {
+    // Use the first path parameter to create urlField
+    const parameter = operation.parameters?.find(
+        param => (param as OpenAPIV3.ParameterObject).in === 'path'
+    ) as OpenAPIV3.ParameterObject | undefined;
+
+    const schema = parameter?.schema;
+    const example = schema && 'example' in schema ? schema.example : undefined;
+
+    return {
+        title: operation.summary || formatPathToTitle(path),
+        description: operation.description || '',
+        method: method.toUpperCase(),
+        path: path,
+        urlField: parameter
+            ? {
+                name: parameter.name,
+                placeholder: parameter.description || undefined,
+                defaultValue: example !== undefined ? String(example) : undefined,
+            }
+            : undefined,
+    };
+}
+
 /**
  * Generate endpoint configurations from OpenAPI paths
  */
@@ -99,12 +135,11 @@ export function generateEndpointConfigs(
     paths: OpenAPIV3.PathsObject
 ): Record<string, EndpointConfig> {
     const endpoints: Record<string, EndpointConfig> = {};
-    const httpMethods = ['get', 'post', 'put', 'patch', 'delete'] as const;
 
     for (const [path, pathItem] of Object.entries(paths)) {
         if (!pathItem) continue;
 
-        for (const method of httpMethods) {
+        for (const method of HTTP_METHODS) {
             const operation = pathItem[method] as OpenAPIV3.OperationObject | undefined;
             if (!operation) continue;
 
@@ -116,48 +151,7 @@ export function generateEndpointConfigs(
 
             const endpointKey = operationId.toLowerCase().replace(/_/g, '-');
 
-            // Helper to format path into a readable title
-            const formatPathToTitle = (path: string) => {
-                return path
-                    .replace(/^\//, '') // Remove leading slash
-                    .replace(/[-_]/g, ' ') // Replace dashes and underscores with spaces
-                    .replace(/\//g, ' ') // Replace remaining slashes with spaces
-                    .split(' ')
-                    .map(word => word.charAt(0).toUpperCase() + word.slice(1)) // Capitalize words
-                    .join(' ');
-            };
-
-            const endpointConfig: EndpointConfig = {
-                title: operation.summary || formatPathToTitle(path),
-                description: operation.description || '',
-                method: method.toUpperCase(),
-                path: path,
-            };
-
-            // Check for path parameters to create urlField
-            if (operation.parameters) {
-                for (const param of operation.parameters) {
-                    const parameter = param as OpenAPIV3.ParameterObject;
-
-                    if (parameter.in === 'path') {
-                        endpointConfig.urlField = {
-                            name: parameter.name,
-                        };
-
-                        if (parameter.description) {
-                            endpointConfig.urlField.placeholder = parameter.description;
-                        }
-
-                        if (parameter.schema && 'example' in parameter.schema) {
-                            endpointConfig.urlField.defaultValue = String(parameter.schema.example);
-                        }
-
-                        break; // Use first path parameter
-                    }
-                }
-            }
-
-            endpoints[endpointKey] = endpointConfig;
+            endpoints[endpointKey] = buildEndpointConfig(path, method, operation);
         }
     }
 
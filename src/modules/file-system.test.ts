@@ -0,0 +1,130 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import { mkdir, mkdtemp, readFile, rm, stat, symlink, utimes, writeFile } from 'fs/promises';
+import { existsSync } from 'fs';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { atomicWrite, copyTree } from './file-system.js';
+
+describe('copyTree up-to-date check', () => {
+    let dir: string;
+    let srcDir: string;
+    let dstDir: string;
+
+    // npm installs give every packaged file one fixed mtime
+    const fixedTime = new Date('1985-10-26T08:15:00Z');
+
+    beforeEach(async () => {
+        dir = await mkdtemp(join(tmpdir(), 'madrasly-test-'));
+        srcDir = join(dir, 'src');
+        dstDir = join(dir, 'dst');
+        await mkdir(srcDir);
+        await mkdir(dstDir);
+    });
+
+    afterEach(async () => {
+        await rm(dir, { recursive: true, force: true });
+    });
+
+    /**
+     * Write the same file name on both sides with the same fixed mtime
+     */
+    async function writePair(src: string, dst: string): Promise<void> {
+        await writeFile(join(srcDir, 'theme.css'), src);
+        await writeFile(join(dstDir, 'theme.css'), dst);
+        await utimes(join(srcDir, 'theme.css'), fixedTime, fixedTime);
+        await utimes(join(dstDir, 'theme.css'), fixedTime, fixedTime);
+    }
+
+    it('copies changed content with the same size and mtime', async () => {
+        await writePair('#00ff00', '#ff0000');
+        expect(await copyTree(srcDir, dstDir)).toBe(true);
+        expect(await readFile(join(dstDir, 'theme.css'), 'utf-8')).toBe('#00ff00');
+    });
+
+    it('copies a file whose size changed', async () => {
+        await writePair('#00ff00ff', '#ff0000');
+        await copyTree(srcDir, dstDir);
+        expect(await readFile(join(dstDir, 'theme.css'), 'utf-8')).toBe('#00ff00ff');
+    });
+
+    it('leaves identical files untouched', async () => {
+        await writePair('#ff0000', '#ff0000');
+        await copyTree(srcDir, dstDir);
+        expect((await stat(join(dstDir, 'theme.css'))).mtimeMs).toBe(fixedTime.getTime());
+    });
+
+    it('copies files missing from the destination', async () => {
+        await writeFile(join(srcDir, 'new.css'), '#0000ff');
+        await copyTree(srcDir, dstDir);
+        expect(await readFile(join(dstDir, 'new.css'), 'utf-8')).toBe('#0000ff');
+    });
+
+    it('copies a symlinked directory as a directory', async () => {
+        await mkdir(join(dir, 'shared'));
+        await writeFile(join(dir, 'shared', 'button.tsx'), 'button');
+        await symlink(join(dir, 'shared'), join(srcDir, 'ui'), 'dir');
+
+        expect(await copyTree(srcDir, dstDir)).toBe(true);
+        expect(await readFile(join(dstDir, 'ui', 'button.tsx'), 'utf-8')).toBe('button');
+    });
+});
+
+describe('atomicWrite', () => {
+    let dir: string;
+    let sourceDir: string;
+    let targetDir: string;
+
+    beforeEach(async () => {
+        dir = await mkdtemp(join(tmpdir(), 'madrasly-test-'));
+        sourceDir = join(dir, 'playground.tmp');
+        targetDir = join(dir, 'playground');
+        await mkdir(join(sourceDir, 'app'), { recursive: true });
+        await writeFile(join(sourceDir, 'app', 'page.tsx'), 'new');
+    });
+
+    afterEach(async () => {
+        await rm(dir, { recursive: true, force: true });
+    });
+
+    /**
+     * Create an existing output tree with installed dependencies and a stale file
+     */
+    async function writeExistingOutput(): Promise<void> {
+        await mkdir(join(targetDir, 'app'), { recursive: true });
+        await mkdir(join(targetDir, 'node_modules', 'next'), { recursive: true });
+        await mkdir(join(targetDir, '.next'));
+        await writeFile(join(targetDir, 'app', 'page.tsx'), 'old');
+        await writeFile(join(targetDir, 'app', 'removed.tsx'), 'old');
+        await writeFile(join(targetDir, 'node_modules', 'next', 'index.js'), 'next');
+        await writeFile(join(targetDir, 'pnpm-lock.yaml'), 'lock');
+    }
+
+    it('moves the source tree into place on first generation', async () => {
+        expect(await atomicWrite(targetDir, sourceDir, false)).toBe(true);
+        expect(await readFile(join(targetDir, 'app', 'page.tsx'), 'utf-8')).toBe('new');
+        expect(existsSync(sourceDir)).toBe(false);
+    });
+
+    it('updates in place and keeps skipped entries on an incremental write', async () => {
+        await writeExistingOutput();
+
+        expect(await atomicWrite(targetDir, sourceDir, true)).toBe(true);
+        expect(await readFile(join(targetDir, 'app', 'page.tsx'), 'utf-8')).toBe('new');
+        expect(existsSync(join(targetDir, 'app', 'removed.tsx'))).toBe(false);
+        expect(existsSync(join(targetDir, 'node_modules', 'next', 'index.js'))).toBe(true);
+        expect(existsSync(join(targetDir, 'pnpm-lock.yaml'))).toBe(true);
+        expect(existsSync(sourceDir)).toBe(false);
+    });
+
+    it('carries dependencies, lockfiles and the build cache over on a full swap', async () => {
+        await writeExistingOutput();
+
+        expect(await atomicWrite(targetDir, sourceDir, false)).toBe(true);
+        expect(await readFile(join(targetDir, 'app', 'page.tsx'), 'utf-8')).toBe('new');
+        expect(existsSync(join(targetDir, 'app', 'removed.tsx'))).toBe(false);
+        expect(await readFile(join(targetDir, 'node_modules', 'next', 'index.js'), 'utf-8')).toBe('next');
+        expect(await readFile(join(targetDir, 'pnpm-lock.yaml'), 'utf-8')).toBe('lock');
+        expect(existsSync(join(targetDir, '.next'))).toBe(true);
+        expect(existsSync(sourceDir)).toBe(false);
+    });
+});
@@ -1,20 +1,27 @@
-import { mkdir, copyFile, rm, readdir, stat } from 'fs/promises';
-import { existsSync, chmodSync } from 'fs';
-import { join, dirname } from 'path';
+import { mkdir, copyFile, chmod, readFile, rename, rm, readdir, stat } from 'fs/promises';
+import { existsSync, constants, type Dirent, type Stats } from 'fs';
+import { join, dirname, sep } from 'path';
+import { fileURLToPath } from 'url';
 import type { CopyOptions } from '../types/index.js';
 
+/**
+ * Locate the bundled templates directory (dist/modules/ -> package root)
+ */
+export function getTemplateDir(): string {
+    const modulesDir = dirname(fileURLToPath(import.meta.url));
+    return join(dirname(dirname(modulesDir)), 'templates');
+}
+
 /**
  * Create directory structure for Next.js project
  */
 export async function createDirectoryStructure(outputDir: string): Promise<void> {
+    // Only leaf directories are listed; recursive mkdir creates their parents
     const dirs = [
-        outputDir,
-        join(outputDir, 'app'),
-        join(outputDir, 'app', 'api'),
         join(outputDir, 'app', 'api', 'run'),
         join(outputDir, 'app', 'api', 'health'),
+        join(outputDir, 'app', 'api', 'openapi-spec'),
         join(outputDir, 'app', '[...slug]'),
-        join(outputDir, 'components'),
         join(outputDir, 'components', 'api-playground'),
         join(outputDir, 'components', 'ui'),
         join(outputDir, 'lib'),
@@ -27,6 +34,74 @@ export async function createDirectoryStructure(outputDir: string): Promise<void>
     }
 }
 
+/**
+ * Template directories copied into the generated app
+ */
+const TEMPLATE_DIRS = ['app', 'components', 'hooks', 'lib'];
+
+/**
+ * Template app files that the generator renders itself instead of copying
+ */
+const GENERATED_APP_FILES = new Set(['app/page.tsx']);
+
+/**
+ * shadcn/ui primitives the playground uses; the rest of templates/components/ui is not copied
+ */
+const UI_COMPONENTS = new Set([
+    'button.tsx',
+    'calendar.tsx',
+    'checkbox.tsx',
+    'dialog.tsx',
+    'input.tsx',
+    'popover.tsx',
+    'select.tsx',
+    'sheet.tsx',
+    'slider.tsx',
+    'switch.tsx',
+    'toast.tsx',
+    'toaster.tsx',
+    'tooltip.tsx',
+]);
+
+/**
+ * List files below a directory as '/'-separated paths prefixed with relDir,
+ * in sorted order; `include` can skip files and prune directories. Dirents
+ * carry their type, so the walk needs one readdir per directory and no
+ * per-entry stat.
+ */
+export async function listFiles(
+    dirPath: string,
+    relDir = '',
+    include: (relPath: string, entry: Dirent) => boolean = () => true
+): Promise<string[]> {
+    const entries = await readdir(dirPath, { withFileTypes: true });
+    entries.sort((a, b) => (a.name < b.name ? -1 : a.name > b.name ? 1 : 0));
+
+    const files: string[] = [];
+    for (const entry of entries) {
+        const rel = relDir ? `${relDir}/${entry.name}` : entry.name;
+        if (!include(rel, entry)) continue;
+
+        if (entry.isDirectory()) {
+            files.push(...(await listFiles(join(dirPath, entry.name), rel, include)));
+        } else if (entry.isFile()) {
+            files.push(rel);
+        }
+    }
+
+    return files;
+}
+
+/**
+ * Whether a template file is copied: generated app files and unused
+ * components/ui primitives are left out
+ */
+function isCopiedTemplateFile(rel: string, entry: Dirent): boolean {
+    if (entry.isDirectory()) return true;
+    if (GENERATED_APP_FILES.has(rel)) return false;
+    return rel !== `components/ui/${entry.name}` || UI_COMPONENTS.has(entry.name);
+}
+
 /**
  * Copy template files from source to destination
  */
@@ -39,90 +114,99 @@ export async function copyTemplateFiles(
     const isBundled = existsSync(join(templateDir, 'components'));
     const prefix = isBundled ? '' : 'src/';
 
-    const filesToCopy = [
-        [`${prefix}components/api-playground/sidebar.tsx`, 'components/api-playground/sidebar.tsx'],
-        [`${prefix}components/api-playground/types.ts`, 'components/api-playground/types.ts'],
-        [`${prefix}components/api-playground/form-field.tsx`, 'components/api-playground/form-field.tsx'],
-        [`${prefix}components/api-playground/code-editor.tsx`, 'components/api-playground/code-editor.tsx'],
-        [`${prefix}components/api-playground/api-page-header.tsx`, 'components/api-playground/api-page-header.tsx'],
-        [`${prefix}components/api-playground/api-form.tsx`, 'components/api-playground/api-form.tsx'],
-        [`${prefix}components/api-playground/resizable-panel.tsx`, 'components/api-playground/resizable-panel.tsx'],
-        [`${prefix}components/api-playground/endpoint-selector.tsx`, 'components/api-playground/endpoint-selector.tsx'],
-        [`${prefix}components/api-playground/markdown-renderer.tsx`, 'components/api-playground/markdown-renderer.tsx'],
-        [`${prefix}lib/openapi-parser.tsx`, 'lib/openapi-parser.tsx'],
-        [`${prefix}lib/openapi-sidebar-parser.ts`, 'lib/openapi-sidebar-parser.ts'],
-        [`${prefix}lib/slug-utils.ts`, 'lib/slug-utils.ts'],
-        [`${prefix}lib/icon-mapper.ts`, 'lib/icon-mapper.ts'],
-        [`${prefix}lib/code-formatter.tsx`, 'lib/code-formatter.tsx'],
-        [`${prefix}lib/code-generator.tsx`, 'lib/code-generator.tsx'],
-        [`${prefix}lib/utils.ts`, 'lib/utils.ts'],
-        [`${prefix}lib/endpoint-search.ts`, 'lib/endpoint-search.ts'],
-        [`${prefix}lib/example-parser.ts`, 'lib/example-parser.ts'],
-        [`${prefix}lib/logger.ts`, 'lib/logger.ts'],
-        [`${prefix}lib/env-validation.ts`, 'lib/env-validation.ts'],
-        [`${prefix}lib/rate-limiter.ts`, 'lib/rate-limiter.ts'],
-        [`${prefix}lib/request-deduplication.ts`, 'lib/request-deduplication.ts'],
-        [`${prefix}components/error-boundary.tsx`, 'components/error-boundary.tsx'],
-        [`${prefix}components/ui/input.tsx`, 'components/ui/input.tsx'],
-        [`${prefix}components/ui/button.tsx`, 'components/ui/button.tsx'],
-        [`${prefix}components/ui/switch.tsx`, 'components/ui/switch.tsx'],
-        [`${prefix}components/ui/select.tsx`, 'components/ui/select.tsx'],
-        [`${prefix}components/ui/popover.tsx`, 'components/ui/popover.tsx'],
-        [`${prefix}components/ui/calendar.tsx`, 'components/ui/calendar.tsx'],
-        [`${prefix}components/ui/checkbox.tsx`, 'components/ui/checkbox.tsx'],
-        [`${prefix}components/ui/slider.tsx`, 'components/ui/slider.tsx'],
-        [`${prefix}components/ui/toast.tsx`, 'components/ui/toast.tsx'],
-        [`${prefix}components/ui/toaster.tsx`, 'components/ui/toaster.tsx'],
-        [`${prefix}components/ui/tooltip.tsx`, 'components/ui/tooltip.tsx'],
-        [`${prefix}components/ui/sheet.tsx`, 'components/ui/sheet.tsx'],
-        [`${prefix}components/ui/dialog.tsx`, 'components/ui/dialog.tsx'],
-        [`${prefix}components/theme-provider.tsx`, 'components/theme-provider.tsx'],
-        [`${prefix}components/theme-switcher.tsx`, 'components/theme-switcher.tsx'],
-        [`${prefix}components/self-destruct-banner.tsx`, 'components/self-destruct-banner.tsx'],
-        [`${prefix}components/self-destruct-banner-wrapper.tsx`, 'components/self-destruct-banner-wrapper.tsx'],
-        [`${prefix}hooks/use-toast.ts`, 'hooks/use-toast.ts'],
-        [`${prefix}hooks/use-mobile.ts`, 'hooks/use-mobile.ts'],
-        [`${prefix}app/globals.css`, 'app/globals.css'],
-        [`${prefix}app/api/run/route.ts`, 'app/api/run/route.ts'],
-        [`${prefix}app/api/health/route.ts`, 'app/api/health/route.ts'],
-        [`${prefix}app/[...slug]/page.tsx`, 'app/[...slug]/page.tsx'],
-        [`${prefix}app/landing-page.tsx`, 'app/landing-page.tsx'],
-    ];
-
-    for (const [src, dst] of filesToCopy) {
-        // Skip layout.tsx if requested
-        if (options.skipLayout && src.includes('layout.tsx')) {
+    const filesToCopy: [string, string][] = [];
+    for (const dir of TEMPLATE_DIRS) {
+        const srcDir = join(templateDir, `${prefix}${dir}`);
+        if (!existsSync(srcDir)) {
+            console.warn(`  ⚠ Warning: Template directory ${prefix}${dir} not found, skipping...`);
             continue;
         }
 
-        const srcPath = join(templateDir, src);
-        const dstPath = join(outputDir, dst);
+        for (const rel of await listFiles(srcDir, dir, isCopiedTemplateFile)) {
+            filesToCopy.push([`${prefix}${rel}`, rel]);
+        }
+    }
+
+    // Skip layout.tsx if requested
+    const pairs = options.skipLayout
+        ? filesToCopy.filter(([src]) => !src.includes('layout.tsx'))
+        : filesToCopy;
 
-        if (existsSync(srcPath)) {
-            await mkdir(dirname(dstPath), { recursive: true });
-            await copyFile(srcPath, dstPath);
-        } else {
-            console.warn(`  ⚠ Warning: Template file ${src} not found, skipping...`);
+    // Create each destination directory once up front instead of per file
+    const parentDirs = new Set(pairs.map(([, dst]) => dirname(join(outputDir, dst))));
+    for (const dir of parentDirs) {
+        await mkdir(dir, { recursive: true });
+    }
+
+    // Copies are independent, so issue them together and let libuv's
+    // threadpool overlap the syscalls
+    await Promise.all(
+        pairs.map(async ([src, dst]) => {
+            const srcPath = join(templateDir, src);
+            const dstPath = join(outputDir, dst);
+
+            // The destination is the fresh temp tree, so there is nothing to
+            // compare against. Clone via reflink where the filesystem supports
+            // it; libuv falls back to an in-kernel copy (copy_file_range/sendfile)
+            await copyFile(srcPath, dstPath, constants.COPYFILE_FICLONE);
+        })
+    );
+}
+
+/**
+ * Check whether dstPath already holds the same bytes as a source file. Only
+ * sizes and contents are compared: mtimes say nothing about the contents, as
+ * package installs give every template file the same fixed mtime.
+ */
+async function isUpToDate(srcPath: string, srcStats: Stats, dstPath: string): Promise<boolean> {
+    try {
+        const dstStats = await stat(dstPath);
+        if (dstStats.size !== srcStats.size) {
+            return false;
         }
+
+        const [srcContent, dstContent] = await Promise.all([readFile(srcPath), readFile(dstPath)]);
+        return srcContent.equals(dstContent);
+    } catch (error) {
+        return false;
     }
 }
 
 /**
- * Perform atomic write operation (temp -> final directory swap)
+ * Package manager lockfiles, which generation never writes
+ */
+const LOCKFILES = ['pnpm-lock.yaml', 'package-lock.json', 'yarn.lock'];
+
+/**
+ * Entries in an existing output tree that a full replacement moves across:
+ * installed dependencies, the lockfiles that pin them and the build cache
+ */
+const PRESERVED_OUTPUT_ENTRIES = ['node_modules', '.next', ...LOCKFILES];
+
+/**
+ * Perform atomic write operation (temp -> final directory swap). Resolves to
+ * false when a copy fallback could not copy every file.
  */
 export async function atomicWrite(
     targetDir: string,
     sourceDir: string,
     incremental: boolean
-): Promise<void> {
+): Promise<boolean> {
+    let complete = true;
+
     if (!existsSync(targetDir)) {
-        // First generation - simple rename
+        // First generation - simple rename, copying only when it fails
+        // (e.g. EXDEV across filesystems)
         await mkdir(dirname(targetDir), { recursive: true });
-        await copyTree(sourceDir, targetDir);
-        await rm(sourceDir, { recursive: true, force: true });
+        try {
+            await rename(sourceDir, targetDir);
+        } catch (error) {
+            complete = await copyTree(sourceDir, targetDir);
+            await rm(sourceDir, { recursive: true, force: true });
+        }
     } else if (incremental) {
         // Incremental update - preserve file watchers
-        await copyTree(sourceDir, targetDir, {
+        complete = await copyTree(sourceDir, targetDir, {
             overwrite: true,
             removeExtra: true,
         });
@@ -135,16 +219,61 @@ export async function atomicWrite(
             await rm(backupDir, { recursive: true, force: true });
         }
 
-        await copyTree(targetDir, backupDir);
-        await rm(targetDir, { recursive: true, force: true });
-        await copyTree(sourceDir, targetDir);
-        await rm(sourceDir, { recursive: true, force: true });
-        await rm(backupDir, { recursive: true, force: true });
+        // Carry installed dependencies and the build cache over to the new tree
+        for (const name of PRESERVED_OUTPUT_ENTRIES) {
+            await rename(join(targetDir, name), join(sourceDir, name)).catch(() => {});
+        }
+
+        // Swap with two renames (metadata-only on the same filesystem) so the
+        // target is only absent for an instant; fall back to copying when the
+        // directory cannot be renamed (e.g. locked on Windows)
+        try {
+            await rename(targetDir, backupDir);
+        } catch (error) {
+            await copyTree(targetDir, backupDir);
+            await rm(targetDir, { recursive: true, force: true });
+        }
+
+        try {
+            await rename(sourceDir, targetDir);
+        } catch (error) {
+            complete = await copyTree(sourceDir, targetDir);
+
+            // copyTree skips the preserved entries, so move them over
+            // before the temp tree is deleted
+            let preserved = true;
+            for (const name of PRESERVED_OUTPUT_ENTRIES) {
+                const preservedPath = join(sourceDir, name);
+                if (existsSync(preservedPath)) {
+                    await rename(preservedPath, join(targetDir, name)).catch(() => {
+                        preserved = false;
+                    });
+                }
+            }
+
+            if (preserved) {
+                await rm(sourceDir, { recursive: true, force: true });
+            } else {
+                console.warn(`  ⚠ Could not move installed dependencies into ${targetDir}; left in ${sourceDir}`);
+            }
+        }
+
+        // The old tree is no longer visible, so delete it without holding up the caller
+        rm(backupDir, { recursive: true, force: true }).catch(() => {});
     }
+
+    return complete;
 }
 
 /**
- * Copy directory tree recursively
+ * Entries copyTree leaves alone by default, built once rather than per recursive call
+ */
+const DEFAULT_SKIP_DIRS: ReadonlySet<string> = new Set(['node_modules', '.next', '.pnpm', '.turbo', 'dist', 'build', '.cache']);
+const DEFAULT_SKIP_FILES: ReadonlySet<string> = new Set(['.DS_Store', ...LOCKFILES]);
+
+/**
+ * Copy directory tree recursively. Resolves to false when a file could not
+ * be copied (reported as a warning) and true otherwise.
  */
 export async function copyTree(
     src: string,
@@ -152,14 +281,14 @@ export async function copyTree(
     options: {
         overwrite?: boolean;
         removeExtra?: boolean;
-        skipDirs?: Set<string>;
-        skipFiles?: Set<string>;
+        skipDirs?: ReadonlySet<string>;
+        skipFiles?: ReadonlySet<string>;
     } = {}
-): Promise<void> {
+): Promise<boolean> {
     const {
         removeExtra = false,
-        skipDirs = new Set(['node_modules', '.next', '.pnpm', '.turbo', 'dist', 'build', '.cache']),
-        skipFiles = new Set(['.DS_Store', 'pnpm-lock.yaml', 'package-lock.json', 'yarn.lock']),
+        skipDirs = DEFAULT_SKIP_DIRS,
+        skipFiles = DEFAULT_SKIP_FILES,
     } = options;
 
     // Create destination if it doesn't exist
@@ -167,56 +296,80 @@ export async function copyTree(
         await mkdir(dst, { recursive: true });
     }
 
-    const srcEntries = await readdir(src);
-    const dstEntries = existsSync(dst) ? await readdir(dst) : [];
-
-    const srcSet = new Set(srcEntries.filter(name => !skipDirs.has(name) && !skipFiles.has(name)));
-    const dstSet = new Set(dstEntries.filter(name => !skipDirs.has(name) && !skipFiles.has(name)));
+    // Dirents carry the entry type, so no per-entry stat is needed to tell
+    // files from directories
+    const srcEntries = (await readdir(src, { withFileTypes: true }))
+        .filter(entry => !skipDirs.has(entry.name) && !skipFiles.has(entry.name));
 
     // Remove files/dirs in dst that aren't in src (if removeExtra is true)
     if (removeExtra) {
-        for (const name of dstSet) {
-            if (!srcSet.has(name)) {
-                const path = join(dst, name);
-                const stats = await stat(path);
-
-                if (stats.isDirectory()) {
-                    await rm(path, { recursive: true, force: true });
-                } else {
-                    await rm(path, { force: true });
-                }
+        const srcNames = new Set(srcEntries.map(entry => entry.name));
+
+        // Single pass over dst: skipped and still-present names are left alone,
+        // everything else is removed as it is encountered
+        for (const entry of await readdir(dst, { withFileTypes: true })) {
+            if (skipDirs.has(entry.name) || skipFiles.has(entry.name) || srcNames.has(entry.name)) {
+                continue;
+            }
+
+            const path = dst + sep + entry.name;
+
+            if (entry.isDirectory()) {
+                await rm(path, { recursive: true, force: true });
+            } else {
+                await rm(path, { force: true });
             }
         }
     }
 
-    // Copy files/dirs from src to dst
-    for (const name of srcSet) {
-        if (skipDirs.has(name) || skipFiles.has(name)) {
-            continue;
+    // Copy files/dirs from src to dst; entry names never contain separators,
+    // so plain concatenation replaces join()'s per-call normalization.
+    // Sibling entries are independent, so files and subtrees copy concurrently.
+    const copied = await Promise.all(srcEntries.map(async (entry): Promise<boolean> => {
+        const srcPath = src + sep + entry.name;
+        const dstPath = dst + sep + entry.name;
+
+        if (entry.isDirectory()) {
+            return copyTree(srcPath, dstPath, options);
         }
 
-        const srcPath = join(src, name);
-        const dstPath = join(dst, name);
+        // stat follows symlinks, so a link to a directory is copied as one
         const stats = await stat(srcPath);
-
         if (stats.isDirectory()) {
-            await copyTree(srcPath, dstPath, options);
-        } else {
-            try {
-                await copyFile(srcPath, dstPath);
-            } catch (err: any) {
-                // Handle permission errors
-                if (err.code === 'EACCES' || err.code === 'EPERM') {
-                    try {
-                        chmodSync(dstPath, 0o666);
-                        await copyFile(srcPath, dstPath);
-                    } catch (retryErr) {
-                        console.warn(`  ⚠ Failed to copy ${srcPath}: ${retryErr}`);
-                    }
-                } else {
-                    throw err;
-                }
-            }
+            return copyTree(srcPath, dstPath, options);
+        }
+
+        // Leave unchanged files alone so dev-server watchers don't reload them
+        if (await isUpToDate(srcPath, stats, dstPath)) {
+            return true;
+        }
+
+        return copyFileWithRetry(srcPath, dstPath);
+    }));
+
+    return copied.every(Boolean);
+}
+
+/**
+ * Copy a file, making a read-only destination writable and retrying once.
+ * Resolves to false if the retry failed too.
+ */
+async function copyFileWithRetry(srcPath: string, dstPath: string): Promise<boolean> {
+    try {
+        await copyFile(srcPath, dstPath);
+    } catch (err: any) {
+        // Handle permission errors
+        if (err.code !== 'EACCES' && err.code !== 'EPERM') {
+            throw err;
+        }
+        try {
+            await chmod(dstPath, 0o666);
+            await copyFile(srcPath, dstPath);
+        } catch (retryErr) {
+            console.warn(`  ⚠ Failed to copy ${srcPath}: ${retryErr}`);
+            return false;
         }
     }
+
+    return true;
 }
@@ -0,0 +1,101 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import { mkdtemp, rm, writeFile } from 'fs/promises';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { loadExistingConfig } from './interactive-prompts.js';
+
+const uiConfig = {
+    sidebar: {
+        workspace: { name: 'Petstore', icon: 'API', image: '/workspace-logo.png' },
+    },
+    endpoints: {
+        'list-pets': { title: 'List pets', description: '', method: 'GET', path: '/pets' },
+    },
+    auth: { mode: 'manual' },
+};
+
+const spec = {
+    openapi: '3.0.0',
+    info: { title: 'Petstore', version: '1.0.0' },
+    paths: { '/pets': { get: { responses: { '200': { description: 'OK' } } } } },
+    'x-ui-config': uiConfig,
+    components: { schemas: { Pet: { type: 'object' } } },
+};
+
+/**
+ * A copy of uiConfig with a different workspace image
+ */
+function withImage(image: string): typeof uiConfig {
+    return { ...uiConfig, sidebar: { workspace: { ...uiConfig.sidebar.workspace, image } } };
+}
+
+describe('loadExistingConfig', () => {
+    let dir: string;
+
+    beforeEach(async () => {
+        dir = await mkdtemp(join(tmpdir(), 'madrasly-test-'));
+    });
+
+    afterEach(async () => {
+        await rm(dir, { recursive: true, force: true });
+    });
+
+    /**
+     * Write openapi.json content and load the workspace config back
+     */
+    async function load(content: string): Promise<{ image?: string } | null> {
+        await writeFile(join(dir, 'openapi.json'), content);
+        return loadExistingConfig(dir);
+    }
+
+    it('reads the image from the layout the generator writes', async () => {
+        expect(await load(JSON.stringify(spec, null, 2))).toEqual({ image: '/workspace-logo.png' });
+    });
+
+    it('reads the image when x-ui-config is the last top-level key', async () => {
+        const { components: _components, ...rest } = spec;
+        expect(await load(JSON.stringify(rest, null, 2))).toEqual({ image: '/workspace-logo.png' });
+    });
+
+    it('handles empty objects inside and as x-ui-config', async () => {
+        const withEmptyValues = { ...spec, 'x-ui-config': { ...uiConfig, endpoints: {}, auth: {} } };
+        expect(await load(JSON.stringify(withEmptyValues, null, 2))).toEqual({ image: '/workspace-logo.png' });
+
+        expect(await load(JSON.stringify({ ...spec, 'x-ui-config': {} }, null, 2))).toBeNull();
+    });
+
+    it('handles CRLF line endings', async () => {
+        const content = JSON.stringify(spec, null, 2).replace(/\n/g, '\r\n');
+        expect(await load(content)).toEqual({ image: '/workspace-logo.png' });
+    });
+
+    it('parses hand-edited files in other layouts in full', async () => {
+        expect(await load(JSON.stringify(spec))).toEqual({ image: '/workspace-logo.png' });
+        expect(await load(JSON.stringify(spec, null, 4))).toEqual({ image: '/workspace-logo.png' });
+        expect(await load(JSON.stringify(spec, null, '\t'))).toEqual({ image: '/workspace-logo.png' });
+    });
+
+    it('ignores nested x-ui-config keys', async () => {
+        const nested = { ...spec, info: { ...spec.info, 'x-ui-config': withImage('/nested.png') } };
+        expect(await load(JSON.stringify(nested, null, 2))).toEqual({ image: '/workspace-logo.png' });
+
+        // With a 1-space indent a key nested one level down sits at exactly two
+        // spaces, after the top-level x-ui-config here
+        const nestedLast = {
+            openapi: spec.openapi,
+            'x-ui-config': uiConfig,
+            info: { ...spec.info, 'x-ui-config': withImage('/nested.png') },
+            paths: spec.paths,
+        };
+        expect(await load(JSON.stringify(nestedLast, null, 1))).toEqual({ image: '/workspace-logo.png' });
+    });
+
+    it('returns null without an image, x-ui-config or file', async () => {
+        const { 'x-ui-config': _uiConfig, ...rest } = spec;
+        expect(await load(JSON.stringify(rest, null, 2))).toBeNull();
+        expect(await load(JSON.stringify({ ...spec, 'x-ui-config': withImage('') }, null, 2))).toBeNull();
+
+        await rm(join(dir, 'openapi.json'));
+        expect(await loadExistingConfig(dir)).toBeNull();
+    });
+});
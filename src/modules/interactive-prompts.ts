@@ -1,8 +1,6 @@
-import prompts from 'prompts';
-import { readFileSync } from 'fs';
-import { existsSync } from 'fs';
+import { readFile } from 'fs/promises';
 import { join } from 'path';
-import type { ExtendedOpenAPISpec, WorkspaceSetupResult, GeneratorConfig } from '../types/index.js';
+import type { ExtendedOpenAPISpec, UIConfig, WorkspaceSetupResult, GeneratorConfig } from '../types/index.js';
 
 /**
  * Run interactive setup for workspace configuration
@@ -31,6 +29,8 @@ export async function runInteractiveSetup(
     console.log('='.repeat(60));
     console.log('Configure your API playground workspace\n');
 
+    // Only interactive first runs need the prompt library
+    const { default: prompts } = await import('prompts');
     const response = await prompts({
         type: 'text',
         name: 'workspaceImage',
@@ -47,28 +47,54 @@ export async function runInteractiveSetup(
     };
 }
 
+/**
+ * Layout of generated openapi.json (2-space JSON indent). Raw newlines cannot
+ * occur inside JSON strings, so in such a file "\n  \"x-ui-config\": " only
+ * matches the top-level key and its object closes at the next "\n  }".
+ */
+const GENERATED_LAYOUT_START = /^\{\r?\n  "/;
+const UI_CONFIG_KEY = '\n  "x-ui-config": ';
+const UI_CONFIG_END = '\n  }';
+
+/**
+ * Parse just the x-ui-config object out of generated openapi.json content.
+ * Files in any other layout (minified, re-indented), or whose slice does not
+ * parse, fall back to parsing the whole document.
+ */
+function parseUIConfig(content: string): UIConfig | undefined {
+    const keyIndex = GENERATED_LAYOUT_START.test(content) ? content.lastIndexOf(UI_CONFIG_KEY) : -1;
+
+    if (keyIndex !== -1) {
+        const valueStart = keyIndex + UI_CONFIG_KEY.length;
+        const valueEnd = content.indexOf(UI_CONFIG_END, valueStart);
+
+        if (content[valueStart] === '{' && valueEnd !== -1) {
+            try {
+                return JSON.parse(content.slice(valueStart, valueEnd + UI_CONFIG_END.length));
+            } catch (error) {
+                // The slice is not a complete object - parse the whole document below
+            }
+        }
+    }
+
+    return (JSON.parse(content) as ExtendedOpenAPISpec)['x-ui-config'];
+}
+
 /**
  * Load existing workspace configuration from previously generated openapi.json
  */
 export async function loadExistingConfig(
     outputDir: string
 ): Promise<{ image?: string } | null> {
-    const openApiPath = join(outputDir, 'openapi.json');
-
-    if (!existsSync(openApiPath)) {
-        return null;
-    }
-
     try {
-        const content = readFileSync(openApiPath, 'utf-8');
-        const spec = JSON.parse(content) as ExtendedOpenAPISpec;
+        const content = await readFile(join(outputDir, 'openapi.json'), 'utf-8');
 
-        const workspaceConfig = spec['x-ui-config']?.sidebar?.workspace;
+        const workspaceConfig = parseUIConfig(content)?.sidebar?.workspace;
         if (workspaceConfig?.image) {
             return { image: workspaceConfig.image };
         }
     } catch (error) {
-        // Ignore errors and return null
+        // Missing or unreadable file - ignore and return null
     }
 
     return null;
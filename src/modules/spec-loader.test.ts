@@ -0,0 +1,128 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import { mkdtemp, readdir, readFile, rm, writeFile } from 'fs/promises';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { containsRef, detectSpecFormat, loadOpenAPISpec } from './spec-loader.js';
+
+describe('containsRef', () => {
+    it('finds $ref pointers at any depth', () => {
+        expect(containsRef({ $ref: '#/components/schemas/Pet' })).toBe(true);
+        expect(containsRef({
+            paths: {
+                '/pets': { get: { responses: { '200': { content: { 'application/json': { schema: { $ref: '#/a' } } } } } } },
+            },
+        })).toBe(true);
+        expect(containsRef({ allOf: [{ type: 'object' }, { $ref: '#/a' }] })).toBe(true);
+    });
+
+    it('returns false for specs without $ref pointers', () => {
+        expect(containsRef({ openapi: '3.0.0', paths: { '/pets': { get: { responses: {} } } } })).toBe(false);
+        expect(containsRef({})).toBe(false);
+        expect(containsRef([])).toBe(false);
+        expect(containsRef(null)).toBe(false);
+        expect(containsRef('#/a')).toBe(false);
+    });
+
+    it('ignores $ref keys that are not pointers', () => {
+        // A property named $ref inside a schema's properties is an object, not a pointer
+        expect(containsRef({ properties: { $ref: { type: 'string' } } })).toBe(false);
+        expect(containsRef({ example: ['$ref'] })).toBe(false);
+    });
+
+    it('only counts pointers matching the predicate', () => {
+        const isExternal = (ref: string) => !ref.startsWith('#');
+        expect(containsRef({ schema: { $ref: '#/components/schemas/Pet' } }, isExternal)).toBe(false);
+        expect(containsRef({ schema: { $ref: './pet.yaml' } }, isExternal)).toBe(true);
+    });
+});
+
+describe('detectSpecFormat', () => {
+    it('uses the extension for YAML files', () => {
+        expect(detectSpecFormat('spec.yaml')).toBe('yaml');
+        expect(detectSpecFormat('spec.YML', '{"openapi": "3.0.0"}')).toBe('yaml');
+    });
+
+    it('defaults to JSON without content', () => {
+        expect(detectSpecFormat('spec.json')).toBe('json');
+        expect(detectSpecFormat('spec')).toBe('json');
+    });
+
+    it('sniffs the first non-whitespace character of the content', () => {
+        expect(detectSpecFormat('spec.json', '{"openapi": "3.0.0"}')).toBe('json');
+        expect(detectSpecFormat('spec', '\r\n  \t[]')).toBe('json');
+        expect(detectSpecFormat('spec.json', 'openapi: 3.0.0\n')).toBe('yaml');
+        expect(detectSpecFormat('spec', '# comment\nopenapi: 3.0.0\n')).toBe('yaml');
+        expect(detectSpecFormat('spec', '')).toBe('yaml');
+    });
+});
+
+describe('loadOpenAPISpec cache', () => {
+    let dir: string;
+    let cacheDir: string;
+    let specPath: string;
+
+    const spec = {
+        openapi: '3.0.0',
+        info: { title: 'Petstore', version: '1.0.0' },
+        paths: {},
+        components: { schemas: { Pet: { type: 'object' } } },
+    };
+
+    beforeEach(async () => {
+        dir = await mkdtemp(join(tmpdir(), 'madrasly-test-'));
+        process.env.XDG_CACHE_HOME = join(dir, 'cache');
+        cacheDir = join(dir, 'cache', 'madrasly');
+        specPath = join(dir, 'openapi.json');
+    });
+
+    afterEach(async () => {
+        delete process.env.XDG_CACHE_HOME;
+        await rm(dir, { recursive: true, force: true });
+    });
+
+    /**
+     * Cache entries currently on disk
+     */
+    async function cacheEntries(): Promise<string[]> {
+        return readdir(cacheDir).catch(() => []);
+    }
+
+    it('keeps one entry per spec and overwrites it when the spec changes', async () => {
+        await writeFile(specPath, JSON.stringify(spec));
+        expect((await loadOpenAPISpec(specPath)).info.title).toBe('Petstore');
+        expect((await cacheEntries()).length).toBe(1);
+
+        // A second load is served from the entry
+        const [entry] = await cacheEntries();
+        const content = await readFile(join(cacheDir, entry), 'utf-8');
+        await writeFile(join(cacheDir, entry), content.replace('Petstore', 'FromCache'));
+        expect((await loadOpenAPISpec(specPath)).info.title).toBe('FromCache');
+
+        await writeFile(specPath, JSON.stringify({ ...spec, info: { ...spec.info, title: 'Renamed spec' } }));
+        expect((await loadOpenAPISpec(specPath)).info.title).toBe('Renamed spec');
+        expect(await cacheEntries()).toEqual([entry]);
+    });
+
+    it('caches specs whose refs are all local', async () => {
+        await writeFile(specPath, JSON.stringify({
+            ...spec,
+            paths: { '/pets': { get: { responses: { '200': { description: 'OK', content: { 'application/json': { schema: { $ref: '#/components/schemas/Pet' } } } } } } } },
+        }));
+        await loadOpenAPISpec(specPath);
+        expect((await cacheEntries()).length).toBe(1);
+    });
+
+    it('does not cache specs that reference other files', async () => {
+        await writeFile(join(dir, 'pet.json'), JSON.stringify({ type: 'object' }));
+        await writeFile(specPath, JSON.stringify({ ...spec, components: { schemas: { Pet: { $ref: './pet.json' } } } }));
+        await loadOpenAPISpec(specPath);
+        expect(await cacheEntries()).toEqual([]);
+    });
+
+    it('does not cache a failed dereference', async () => {
+        await writeFile(specPath, JSON.stringify({ ...spec, components: { schemas: { Pet: { $ref: '#/components/schemas/Missing' } } } }));
+        const loaded = await loadOpenAPISpec(specPath);
+        expect(loaded.components?.schemas?.Pet).toEqual({ $ref: '#/components/schemas/Missing' });
+        expect(await cacheEntries()).toEqual([]);
+    });
+});
@@ -1,27 +1,60 @@
-import SwaggerParser from '@apidevtools/swagger-parser';
-import { readFileSync } from 'fs';
-import { load as loadYaml } from 'js-yaml';
-import { extname } from 'path';
+import { mkdir, readFile, rename, rm, stat, writeFile } from 'fs/promises';
+import { createHash } from 'crypto';
+import { homedir } from 'os';
+import { load as loadYaml, CORE_SCHEMA, types as yamlTypes } from 'js-yaml';
+import { dirname, extname, join, resolve } from 'path';
 import type { ExtendedOpenAPISpec } from '../types/index.js';
 import type { OpenAPIV3 } from 'openapi-types';
 
+/**
+ * YAML schema used for specs: the core schema plus merge keys. Skipping the
+ * timestamp/binary/set resolvers of the default schema makes scalar resolution
+ * cheaper and keeps date-like values as strings, as they are in JSON specs.
+ */
+const SPEC_YAML_SCHEMA = CORE_SCHEMA.extend({ implicit: [yamlTypes.merge] });
+
 /**
  * Load and parse OpenAPI spec from file (supports JSON and YAML)
  */
 export async function loadOpenAPISpec(filePath: string): Promise<ExtendedOpenAPISpec> {
     try {
-        const format = detectSpecFormat(filePath);
-        const content = readFileSync(filePath, 'utf-8');
+        // Reuse the dereferenced spec from an earlier run if the file is unchanged
+        const cache = await getSpecCache(filePath);
+        const cached = await readSpecCache(cache);
+        if (cached) {
+            return cached as ExtendedOpenAPISpec;
+        }
 
         let spec: any;
-        if (format === 'yaml') {
-            spec = loadYaml(content);
+        if (detectSpecFormat(filePath) === 'yaml') {
+            spec = parseYaml(await readFile(filePath, 'utf-8'));
         } else {
-            spec = JSON.parse(content);
+            // Not named .yaml/.yml - sniff the content to pick the parser
+            const content = await readFile(filePath, 'utf-8');
+            if (detectSpecFormat(filePath, content) === 'yaml') {
+                spec = parseYaml(content);
+            } else {
+                spec = parseJsonOrYaml(content);
+            }
         }
 
-        // Dereference $ref pointers
-        const dereferenced = await dereferenceSpec(spec);
+        if (spec === null || typeof spec !== 'object') {
+            throw new Error('Spec does not contain an OpenAPI document');
+        }
+
+        // The cache key only covers this file, so specs that $ref other files
+        // or URLs are not cached (checked first: dereferencing works in place)
+        const cacheable = !containsRef(spec, ref => !ref.startsWith('#'));
+
+        // Dereference $ref pointers; a failed dereference is never cached so
+        // later runs retry it and report the failure again
+        const dereferenced = await tryDereferenceSpec(spec);
+        if (!dereferenced) {
+            return spec as ExtendedOpenAPISpec;
+        }
+        if (cacheable) {
+            await writeSpecCache(cache, dereferenced);
+        }
 
         return dereferenced as ExtendedOpenAPISpec;
     } catch (error) {
@@ -33,15 +66,111 @@ export async function loadOpenAPISpec(filePath: string): Promise<ExtendedOpenAPI
 }
 
 /**
- * Detect if file is JSON or YAML based on extension
+ * Parse YAML spec content
  */
-export function detectSpecFormat(filePath: string): 'json' | 'yaml' {
+function parseYaml(content: string): any {
+    return loadYaml(content, { schema: SPEC_YAML_SCHEMA });
+}
+
+/**
+ * Parse JSON, retrying the already-read content as YAML (flow-style YAML can
+ * also start with '{'). The JSON error is reported if both parsers fail.
+ */
+function parseJsonOrYaml(content: string): any {
+    try {
+        return JSON.parse(content);
+    } catch (jsonError) {
+        try {
+            return parseYaml(content);
+        } catch (yamlError) {
+            throw jsonError;
+        }
+    }
+}
+
+/**
+ * Cache entry for a spec file: one file per resolved path, overwritten
+ * whenever the spec changes, plus the size/mtime key it must match
+ */
+interface SpecCache {
+    path: string;
+    key: string;
+}
+
+/**
+ * Per-user cache directory ($XDG_CACHE_HOME or ~/.cache). Unlike the shared
+ * OS temp directory, other local users cannot plant entries here.
+ */
+function getSpecCacheDir(): string {
+    return join(process.env.XDG_CACHE_HOME || join(homedir(), '.cache'), 'madrasly');
+}
+
+/**
+ * Locate the cache entry for a spec file and compute the key its current
+ * contents must match
+ */
+async function getSpecCache(filePath: string): Promise<SpecCache> {
+    const resolvedPath = resolve(filePath);
+    const stats = await stat(resolvedPath);
+    return {
+        path: join(getSpecCacheDir(), `dereferenced-${createHash('sha1').update(resolvedPath).digest('hex')}.json`),
+        key: `${stats.size}:${stats.mtimeMs}`,
+    };
+}
+
+/**
+ * Read a cached spec, or undefined on a cache miss, a stale entry or an
+ * unreadable file. The key is stored on the first line, so a stale entry is
+ * rejected without parsing the spec.
+ */
+async function readSpecCache(cache: SpecCache): Promise<OpenAPIV3.Document | undefined> {
+    try {
+        const content = await readFile(cache.path, 'utf-8');
+        const keyEnd = content.indexOf('\n');
+        if (keyEnd === -1 || content.slice(0, keyEnd) !== cache.key) {
+            return undefined;
+        }
+        return JSON.parse(content.slice(keyEnd + 1));
+    } catch (error) {
+        return undefined;
+    }
+}
+
+/**
+ * Cache a dereferenced spec. Writes go to a temp name and are renamed so
+ * concurrent runs never read a partial file; specs that cannot be
+ * serialized (circular $refs) are simply not cached.
+ */
+async function writeSpecCache(cache: SpecCache, spec: OpenAPIV3.Document): Promise<void> {
+    const tempCachePath = `${cache.path}.${process.pid}.tmp`;
+    try {
+        await mkdir(dirname(cache.path), { recursive: true, mode: 0o700 });
+        await writeFile(tempCachePath, `${cache.key}\n${JSON.stringify(spec)}`);
+        await rename(tempCachePath, cache.path);
+    } catch (error) {
+        // Caching is best-effort
+        await rm(tempCachePath, { force: true });
+    }
+}
+
+/**
+ * Detect if file is JSON or YAML based on extension, falling back to the
+ * first non-whitespace character of the content when it is provided
+ */
+export function detectSpecFormat(filePath: string, content?: string): 'json' | 'yaml' {
     const ext = extname(filePath).toLowerCase();
 
     if (ext === '.yaml' || ext === '.yml') {
         return 'yaml';
     }
 
+    if (content !== undefined) {
+        const firstChar = /^\s*(\S)/.exec(content)?.[1];
+        if (firstChar !== '{' && firstChar !== '[') {
+            return 'yaml';
+        }
+    }
+
     return 'json';
 }
 
@@ -49,25 +178,64 @@ export function detectSpecFormat(filePath: string): 'json' | 'yaml' {
  * Dereference $ref pointers in OpenAPI spec
  */
 export async function dereferenceSpec(spec: OpenAPIV3.Document): Promise<OpenAPIV3.Document> {
+    return (await tryDereferenceSpec(spec)) ?? spec;
+}
+
+/**
+ * Dereference $ref pointers, warning and resolving to undefined on failure
+ */
+async function tryDereferenceSpec(spec: OpenAPIV3.Document): Promise<OpenAPIV3.Document | undefined> {
+    // Already-flat specs have nothing to resolve, so skip the parser entirely
+    if (!containsRef(spec)) {
+        return spec;
+    }
+
     try {
-        // SwaggerParser.dereference resolves all $ref pointers
+        // SwaggerParser.dereference resolves all $ref pointers; the parser is
+        // only loaded for specs that actually contain refs
+        const { default: SwaggerParser } = await import('@apidevtools/swagger-parser');
         const dereferenced = await SwaggerParser.dereference(spec as any);
         return dereferenced as OpenAPIV3.Document;
     } catch (error) {
-        // If dereferencing fails, log warning and return original spec
+        // If dereferencing fails, log warning and continue with the original spec
         console.warn('Warning: Failed to dereference spec, continuing with original');
         if (error instanceof Error) {
             console.warn(`  ${error.message}`);
         }
-        return spec;
+        return undefined;
     }
 }
 
+/**
+ * Check whether any object in the spec holds a $ref pointer, optionally only
+ * counting pointers that match a predicate
+ */
+export function containsRef(value: unknown, matches: (ref: string) => boolean = () => true): boolean {
+    const stack: unknown[] = [value];
+
+    while (stack.length > 0) {
+        const current = stack.pop();
+        if (current === null || typeof current !== 'object') continue;
+
+        const ref = Array.isArray(current) ? undefined : (current as Record<string, unknown>).$ref;
+        if (typeof ref === 'string' && matches(ref)) {
+            return true;
+        }
+
+        for (const child of Object.values(current)) {
+            stack.push(child);
+        }
+    }
+
+    return false;
+}
+
 /**
  * Validate that spec is a valid OpenAPI 3.x spec
  */
 export async function validateSpec(spec: any): Promise<boolean> {
     try {
+        const { default: SwaggerParser } = await import('@apidevtools/swagger-parser');
         await SwaggerParser.validate(spec);
         return true;
     } catch (error) {
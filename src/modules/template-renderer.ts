@@ -1,96 +1,17 @@
+import { readFileSync } from 'fs';
+import { join } from 'path';
+import { getTemplateDir } from './file-system.js';
 import type { ExtendedOpenAPISpec } from '../types/index.js';
 
+let layoutTemplate: string | undefined;
+
 /**
  * Render layout.tsx with theme support
  */
 export function renderLayout(theme: string, _spec: ExtendedOpenAPISpec): string {
-
-  return `import type { Metadata } from 'next'
-import { Geist, Geist_Mono } from 'next/font/google'
-import { Analytics } from '@vercel/analytics/next'
-import { Toaster } from '@/components/ui/toaster'
-import { ThemeProvider } from '@/components/theme-provider'
-import './globals.css'
-import { readFileSync } from 'fs'
-import { join } from 'path'
-
-const _geist = Geist({ subsets: ["latin"] });
-const _geistMono = Geist_Mono({ subsets: ["latin"] });
-
-// Read OpenAPI spec to get title and workspace image
-let openApiSpec: any = null
-let apiTitle = 'API Playground'
-let workspaceImage: string | undefined = undefined
-
-try {
-  const openApiPath = join(process.cwd(), 'openapi.json')
-  const openApiContent = readFileSync(openApiPath, 'utf-8')
-  openApiSpec = JSON.parse(openApiContent)
-  apiTitle = openApiSpec?.info?.title || 'API Playground'
-  workspaceImage = openApiSpec?.['x-ui-config']?.sidebar?.workspace?.image
-} catch (error) {
-  // If openapi.json doesn't exist, use defaults
-}
-
-// Build icons configuration
-const iconsConfig: Metadata['icons'] = workspaceImage
-  ? {
-      icon: [
-        {
-          url: workspaceImage,
-          ...(workspaceImage.endsWith('.svg') ? { type: 'image/svg+xml' } : {}),
-        },
-      ],
-      apple: workspaceImage,
-    }
-  : {
-      icon: [
-        {
-          url: '/icon-light-32x32.png',
-          media: '(prefers-color-scheme: light)',
-        },
-        {
-          url: '/icon-dark-32x32.png',
-          media: '(prefers-color-scheme: dark)',
-        },
-        {
-          url: '/icon.svg',
-          type: 'image/svg+xml',
-        },
-      ],
-      apple: '/apple-icon.png',
-    }
-
-export const metadata: Metadata = {
-  title: apiTitle,
-  description: openApiSpec?.info?.description || 'API Playground',
-  generator: 'v0.app',
-  icons: iconsConfig,
-}
-
-export default function RootLayout({
-  children,
-}: Readonly<{
-  children: React.ReactNode
-}>) {
-  return (
-    <html lang="en" suppressHydrationWarning>
-      <body className="font-sans antialiased">
-        <ThemeProvider
-          attribute="data-theme"
-          defaultTheme="${theme}"
-          themes={['light', 'dark', 'coffee']}
-          enableSystem={false}
-        >
-          {children}
-          <Toaster />
-        </ThemeProvider>
-        <Analytics />
-      </body>
-    </html>
-  )
-}
-`;
+  // The template ships in templates/ and is read once per process
+  layoutTemplate ??= readFileSync(join(getTemplateDir(), 'layout.tsx.tmpl'), 'utf-8');
+  return layoutTemplate.replace('__DEFAULT_THEME__', theme);
 }
 
 /**
@@ -330,6 +251,27 @@ export function renderTsConfig(): object {
   };
 }
 
+/**
+ * package.json and tsconfig.json never vary between runs, so they are
+ * serialized once when the module loads
+ */
+const PACKAGE_JSON_CONTENT = JSON.stringify(renderPackageJson(), null, 2);
+const TS_CONFIG_CONTENT = JSON.stringify(renderTsConfig(), null, 2);
+
+/**
+ * Generate serialized package.json content
+ */
+export function renderPackageJsonContent(): string {
+  return PACKAGE_JSON_CONTENT;
+}
+
+/**
+ * Generate serialized tsconfig.json content
+ */
+export function renderTsConfigContent(): string {
+  return TS_CONFIG_CONTENT;
+}
+
 /**
  * Generate next.config.mjs
  */
@@ -455,6 +397,9 @@ yarn-error.log*
 # TypeScript
 *.tsbuildinfo
 next-env.d.ts
+
+# madrasly regeneration hash
+.gen-hash
 `;
 }
 
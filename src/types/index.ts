@@ -8,10 +8,12 @@ export const GeneratorConfigSchema = z.object({
     specPath: z.string(),
     outputDir: z.string(),
     force: z.boolean().default(false),
+    fullSwap: z.boolean().default(false),
     apiKey: z.string().optional(),
     workspaceImage: z.string().optional(),
     theme: z.enum(['light', 'dark', 'coffee']).default('light'),
     interactive: z.boolean().default(true),
+    verbose: z.boolean().default(false),
     popularEndpoints: z.array(z.string()).optional(),
 });
 
@@ -91,6 +93,7 @@ export interface GenerationResult {
     outputDir: string;
     duration: number;
     errors?: Error[];
+    skipped?: boolean;
 }
 
 /**
@@ -13,6 +13,7 @@
  *   --popular-endpoints LIST   Comma-separated list of endpoint keys for landing page
  *   --no-interactive           Skip interactive prompts
  *   --use-python-generator     Use legacy Python generator instead of TypeScript
+ *   --verbose                  Log every generation step and generated file
  */
 
 
@@ -22,55 +23,43 @@ import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import { dirname } from 'path';
+import { parseArgs } from 'util';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
-const openapiFile = process.argv[2] || 'example-spec.yaml';
-const outputDir = process.argv[3] || 'example';
-
-
-// Parse --api-key argument if provided
-let apiKey = null;
-for (let i = 0; i < process.argv.length; i++) {
-  if (process.argv[i] === '--api-key' && i + 1 < process.argv.length) {
-    apiKey = process.argv[i + 1];
-    break;
-  }
-}
-
-// Parse --workspace-image argument if provided
-let workspaceImage = null;
-for (let i = 0; i < process.argv.length; i++) {
-  if (process.argv[i] === '--workspace-image' && i + 1 < process.argv.length) {
-    workspaceImage = process.argv[i + 1];
-    break;
-  }
-}
+// Parse all arguments in a single pass
+const { values: flags, positionals } = parseArgs({
+  args: process.argv.slice(2),
+  allowPositionals: true,
+  strict: false,
+  options: {
+    'api-key': { type: 'string' },
+    'workspace-image': { type: 'string' },
+    'theme': { type: 'string' },
+    'popular-endpoints': { type: 'string' },
+    'no-interactive': { type: 'boolean' },
+    'use-python-generator': { type: 'boolean' },
+    'verbose': { type: 'boolean' },
+  },
+});
 
-// Parse --theme argument if provided
-let theme = null;
-for (let i = 0; i < process.argv.length; i++) {
-  if (process.argv[i] === '--theme' && i + 1 < process.argv.length) {
-    theme = process.argv[i + 1];
-    break;
-  }
-}
+const openapiFile = positionals[0] || 'example-spec.yaml';
+const outputDir = positionals[1] || 'example';
 
-// Parse --popular-endpoints argument if provided
-let popularEndpoints = null;
-for (let i = 0; i < process.argv.length; i++) {
-  if (process.argv[i] === '--popular-endpoints' && i + 1 < process.argv.length) {
-    popularEndpoints = process.argv[i + 1];
-    break;
-  }
-}
+// With strict: false a trailing value flag (e.g. `--theme` with nothing
+// after it) parses as true, so only accept actual strings
+const stringFlag = (name) => (typeof flags[name] === 'string' && flags[name]) || null;
 
-// Parse --no-interactive argument
-const noInteractive = process.argv.includes('--no-interactive');
+const apiKey = stringFlag('api-key');
+const workspaceImage = stringFlag('workspace-image');
+const theme = stringFlag('theme');
+const popularEndpoints = stringFlag('popular-endpoints');
+const noInteractive = flags['no-interactive'] === true;
+const verbose = flags['verbose'] === true;
 
-// Parse --use-python-generator argument (fallback to legacy generator)
-const usePythonGenerator = process.argv.includes('--use-python-generator');
+// Fallback to legacy generator
+const usePythonGenerator = flags['use-python-generator'] === true;
 
 let isGenerating = false;
 let regenerateTimeout = null;
@@ -109,9 +98,13 @@ function regenerate() {
       args = [
         path.join(__dirname, 'dist/cli.js'),
         openapiFile,
-        outputDir,
-        '--force'
+        outputDir
       ];
+      // No --force: the generator skips runs where the spec, options and
+      // templates are unchanged (e.g. a save without edits)
+      if (verbose) {
+        args.push('--verbose');
+      }
     }
 
     // Add common arguments